@@ -8,98 +8,229 @@ import sys
 import time
 import json
 import hashlib
+import tempfile
 import argparse
 import configparser
 import requests
-from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode
+from typing import Any, Dict, List, Optional, Tuple
+
+# orjson is optional; fall back to the standard library if it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON from bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+class TTLCache:
+    """On-disk cache of API responses, each entry stored with an expiry time"""
+    
+    DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'podcastindex_inspector')
+    
+    def __init__(self, cache_dir: str = DEFAULT_DIR):
+        """Initialize with the directory to store cache entries in"""
+        self.cache_dir = cache_dir
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        """Build a fixed-length cache key for a request"""
+        return hashlib.md5(f"{endpoint}?{urlencode(params)}".encode()).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cache entry for a key, expired or not, or None if missing"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(entry, dict) or 'data' not in entry:
+            return None
+        
+        return entry
+    
+    @staticmethod
+    def is_fresh(entry: Dict) -> bool:
+        """Check whether a cache entry has not yet expired"""
+        return time.time() < entry.get('expires_at', 0)
+    
+    def set(self, key: str, data: Dict, ttl: int, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """Store data for a key, expiring after ttl seconds, with validators for revalidation"""
+        entry = {
+            'expires_at': time.time() + ttl,
+            'etag': etag,
+            'last_modified': last_modified,
+            'data': data
+        }
+        
+        # Write to a temporary file and rename it so readers never see a partial entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_json_dumps(entry))
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # The cache is best effort; a failed write just means a miss next time
+            pass
+
 
 class PodcastIndexAPI:
     """Class to interact with the Podcastindex API"""
     
     BASE_URL = "https://api.podcastindex.org/api/1.0"
+    USER_AGENT = 'PodcastindexInspector/1.0'
     
-    def __init__(self, api_key: str, api_secret: str):
-        """Initialize with API credentials"""
+    # Default cache lifetimes in seconds
+    PODCAST_TTL = 3600
+    EPISODES_TTL = 900
+    
+    def __init__(self, api_key: str, api_secret: str, cache: Optional[TTLCache] = None,
+                 cache_ttl: Optional[int] = None):
+        """Initialize with API credentials and an optional response cache"""
         self.api_key = api_key
         self.api_secret = api_secret
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        
+        # Auth headers only change once per second, so keep the last set around
+        self._auth_cache = (0, None)
+        
+        # Reuse one connection pool for all requests to the API host
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount('https://', adapter)
+        self._session.headers['User-Agent'] = self.USER_AGENT
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def _get_auth_headers(self) -> Dict:
         """Generate authentication headers for API requests"""
         epoch_time = int(time.time())
+        cached_time, cached_headers = self._auth_cache
+        if epoch_time == cached_time:
+            return cached_headers
+        
         data_to_hash = self.api_key + self.api_secret + str(epoch_time)
         sha_1 = hashlib.sha1(data_to_hash.encode()).hexdigest()
         
-        return {
+        headers = {
             'X-Auth-Date': str(epoch_time),
             'X-Auth-Key': self.api_key,
-            'Authorization': sha_1,
-            'User-Agent': 'PodcastindexInspector/1.0'
+            'Authorization': sha_1
         }
+        self._auth_cache = (epoch_time, headers)
+        return headers
     
-    def get_podcast_by_feed_url(self, feed_url: str) -> Dict:
-        """Get podcast information by feed URL"""
-        endpoint = f"{self.BASE_URL}/podcasts/byfeedurl"
-        params = {'url': feed_url}
+    def _get(self, endpoint: str, params: Dict, ttl: int, what: str) -> Dict:
+        """Send a GET request to the API, serving it from the cache when possible"""
+        key = TTLCache.make_key(endpoint, params)
+        if self.cache_ttl is not None:
+            ttl = self.cache_ttl
+        
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None and TTLCache.is_fresh(entry):
+                return entry['data']
+        
+        # Revalidate an expired entry with a conditional request instead of refetching it
+        headers = dict(self._get_auth_headers())
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
         
         try:
-            response = requests.get(
+            response = self._session.get(
                 endpoint,
-                headers=self._get_auth_headers(),
+                headers=headers,
                 params=params
             )
             
-            if response.status_code != 200:
-                raise Exception(f"Error getting podcast: {response.status_code} - {response.text}")
+            if response.status_code == 304 and entry is not None:
+                self.cache.set(key, entry['data'], ttl, entry.get('etag'), entry.get('last_modified'))
+                return entry['data']
             
-            return response.json()
+            response.raise_for_status()
+            data = _json_loads(response.content)
+        except requests.exceptions.HTTPError as e:
+            raise RuntimeError(f"Error getting {what}: {e.response.status_code} - {e.response.text}") from e
         except requests.exceptions.RequestException as e:
-            raise Exception(f"Request error when getting podcast: {e}")
+            raise RuntimeError(f"Request error when getting {what}: {e}") from e
+        
+        # Only cache successful lookups so that transient API errors are retried next run
+        if self.cache is not None and data.get('status') == 'true':
+            self.cache.set(key, data, ttl, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        
+        return data
+    
+    def get_podcast_by_feed_url(self, feed_url: str) -> Dict:
+        """Get podcast information by feed URL"""
+        endpoint = f"{self.BASE_URL}/podcasts/byfeedurl"
+        params = {'url': feed_url}
+        return self._get(endpoint, params, self.PODCAST_TTL, 'podcast')
     
     def get_podcast_by_feed_id(self, feed_id: int) -> Dict:
         """Get podcast information by feed ID"""
         endpoint = f"{self.BASE_URL}/podcasts/byfeedid"
         params = {'id': feed_id}
-        
-        try:
-            response = requests.get(
-                endpoint,
-                headers=self._get_auth_headers(),
-                params=params
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Error getting podcast: {response.status_code} - {response.text}")
-            
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request error when getting podcast: {e}")
+        return self._get(endpoint, params, self.PODCAST_TTL, 'podcast')
     
     def get_episodes_by_feed_id(self, feed_id: int, max_results: int = 1000) -> Dict:
         """Get episodes for a podcast by feed ID"""
         endpoint = f"{self.BASE_URL}/episodes/byfeedid"
         params = {'id': feed_id, 'max': max_results}
-        
-        try:
-            response = requests.get(
-                endpoint,
-                headers=self._get_auth_headers(),
-                params=params
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Error getting episodes: {response.status_code} - {response.text}")
-            
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request error when getting episodes: {e}")
+        return self._get(endpoint, params, self.EPISODES_TTL, 'episodes')
 
 
 class PodcastInspector:
     """Main class for identifying duplicate podcast episodes"""
     
-    def __init__(self, api_key: str, api_secret: str):
-        """Initialize with API credentials"""
-        self.api = PodcastIndexAPI(api_key, api_secret)
+    def __init__(self, api_key: str, api_secret: str, cache: Optional[TTLCache] = None,
+                 cache_ttl: Optional[int] = None):
+        """Initialize with API credentials and an optional response cache"""
+        self.api = PodcastIndexAPI(api_key, api_secret, cache, cache_ttl)
+    
+    def close(self) -> None:
+        """Release API resources"""
+        self.api.close()
     
     def get_podcast_by_feed_url(self, feed_url: str) -> Dict:
         """Get podcast information by feed URL"""
@@ -128,30 +259,40 @@ class PodcastInspector:
         
         return response.get('items', [])
     
+    def get_podcast_and_episodes_by_feed_id(self, feed_id: int, max_results: int = 1000) -> Tuple[Dict, List[Dict]]:
+        """Get podcast information and episodes by feed ID, fetching both concurrently"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            podcast_future = executor.submit(self.get_podcast_by_feed_id, feed_id)
+            episodes_future = executor.submit(self.get_episodes_by_feed_id, feed_id, max_results)
+            return podcast_future.result(), episodes_future.result()
+    
     def find_duplicate_episodes(self, episodes: List[Dict]) -> Dict[str, List[Dict]]:
         """Find duplicate episodes based on title or episode number"""
-        episodes_by_title = {}
-        episodes_by_number = {}
-        
-        # Group episodes by title
-        for episode in episodes:
-            title = episode.get('title', '').strip()
-            if title:
-                if title not in episodes_by_title:
-                    episodes_by_title[title] = []
-                episodes_by_title[title].append(episode)
-        
-        # Group episodes by episode number
-        for episode in episodes:
-            episode_num = episode.get('episode')
-            if episode_num:
-                if episode_num not in episodes_by_number:
-                    episodes_by_number[episode_num] = []
-                episodes_by_number[episode_num].append(episode)
-        
-        # Filter to only include duplicates
-        duplicate_titles = {title: episodes for title, episodes in episodes_by_title.items() if len(episodes) > 1}
-        duplicate_numbers = {number: episodes for number, episodes in episodes_by_number.items() if len(episodes) > 1}
+        if len(episodes) < 2:
+            return {'by_title': {}, 'by_number': {}}
+        
+        # Count titles and episode numbers first so that only duplicated keys get a group.
+        # Interning lets repeated titles share one string object for faster lookups.
+        title_counts = Counter(
+            sys.intern(title)
+            for title in (episode.get('title', '').strip() for episode in episodes)
+            if title
+        )
+        number_counts = Counter(episode.get('episode') for episode in episodes if episode.get('episode'))
+        
+        duplicate_titles = {title: [] for title, count in title_counts.items() if count > 1}
+        duplicate_numbers = {number: [] for number, count in number_counts.items() if count > 1}
+        
+        # Collect the episodes belonging to each duplicated key
+        if duplicate_titles or duplicate_numbers:
+            for episode in episodes:
+                title = episode.get('title', '').strip()
+                if title in duplicate_titles:
+                    duplicate_titles[title].append(episode)
+                
+                episode_num = episode.get('episode')
+                if episode_num in duplicate_numbers:
+                    duplicate_numbers[episode_num].append(episode)
         
         return {
             'by_title': duplicate_titles,
@@ -160,15 +301,18 @@ class PodcastInspector:
     
     def print_episodes(self, episodes: List[Dict]) -> None:
         """Print episode information"""
-        print(f"\nFound {len(episodes)} episodes:")
+        lines = [f"\nFound {len(episodes)} episodes:"]
         
         for i, episode in enumerate(episodes, 1):
-            print(f"{i}. ID: {episode.get('id')}")
-            print(f"   Title: {episode.get('title')}")
-            print(f"   Date: {episode.get('datePublished')}")
-            print(f"   Episode #: {episode.get('episode')}")
-            print(f"   URL: {episode.get('enclosureUrl')}")
-            print()
+            lines.append(f"{i}. ID: {episode.get('id')}")
+            lines.append(f"   Title: {episode.get('title')}")
+            lines.append(f"   Date: {episode.get('datePublished')}")
+            lines.append(f"   Episode #: {episode.get('episode')}")
+            lines.append(f"   URL: {episode.get('enclosureUrl')}")
+            lines.append("")
+        
+        # Write everything at once rather than issuing a print per line
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def print_duplicates(self, duplicates: Dict[str, List[Dict]]) -> None:
         """Print duplicate episodes"""
@@ -179,27 +323,29 @@ class PodcastInspector:
             print("No duplicate episodes found.")
             return
         
-        print("\n=== Duplicate Episodes ===\n")
+        lines = ["\n=== Duplicate Episodes ===\n"]
         
         if duplicate_titles:
-            print("Duplicates by title:")
+            lines.append("Duplicates by title:")
             for title, episodes in duplicate_titles.items():
-                print(f"\nTitle: {title}")
+                lines.append(f"\nTitle: {title}")
                 for i, episode in enumerate(episodes, 1):
-                    print(f"  {i}. ID: {episode.get('id')}")
-                    print(f"     Date: {episode.get('datePublished')}")
-                    print(f"     Episode #: {episode.get('episode')}")
-                    print(f"     URL: {episode.get('enclosureUrl')}")
+                    lines.append(f"  {i}. ID: {episode.get('id')}")
+                    lines.append(f"     Date: {episode.get('datePublished')}")
+                    lines.append(f"     Episode #: {episode.get('episode')}")
+                    lines.append(f"     URL: {episode.get('enclosureUrl')}")
         
         if duplicate_numbers:
-            print("\nDuplicates by episode number:")
+            lines.append("\nDuplicates by episode number:")
             for number, episodes in duplicate_numbers.items():
-                print(f"\nEpisode #: {number}")
+                lines.append(f"\nEpisode #: {number}")
                 for i, episode in enumerate(episodes, 1):
-                    print(f"  {i}. ID: {episode.get('id')}")
-                    print(f"     Title: {episode.get('title')}")
-                    print(f"     Date: {episode.get('datePublished')}")
-                    print(f"     URL: {episode.get('enclosureUrl')}")
+                    lines.append(f"  {i}. ID: {episode.get('id')}")
+                    lines.append(f"     Title: {episode.get('title')}")
+                    lines.append(f"     Date: {episode.get('datePublished')}")
+                    lines.append(f"     URL: {episode.get('enclosureUrl')}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def export_duplicates(self, duplicates: Dict[str, List[Dict]]) -> None:
         """Export duplicate episodes to a JSON file"""
@@ -210,14 +356,17 @@ class PodcastInspector:
             print("No duplicate episodes found to export.")
             return
         
-        # Create a list to store episodes to export
+        # Create a list to store episodes to export, tracking IDs already added
         episodes_to_export = []
+        exported_ids = set()
         
         # Add duplicates by title
         for title, episodes in duplicate_titles.items():
             for episode in episodes:
+                episode_id = episode.get('id')
+                exported_ids.add(episode_id)
                 episodes_to_export.append({
-                    'id': episode.get('id'),
+                    'id': episode_id,
                     'title': episode.get('title'),
                     'episode_number': episode.get('episode'),
                     'date_published': episode.get('datePublished'),
@@ -231,7 +380,8 @@ class PodcastInspector:
             for episode in episodes:
                 # Check if this episode is already in the export list (from title duplicates)
                 episode_id = episode.get('id')
-                if not any(e['id'] == episode_id for e in episodes_to_export):
+                if episode_id not in exported_ids:
+                    exported_ids.add(episode_id)
                     episodes_to_export.append({
                         'id': episode_id,
                         'title': episode.get('title'),
@@ -245,25 +395,67 @@ class PodcastInspector:
         # Export episodes to a file
         export_file = f"podcast_episodes_export_{int(time.time())}.json"
         print(f"\nExporting {len(episodes_to_export)} episodes to {export_file}")
-        with open(export_file, 'w') as f:
-            json.dump(episodes_to_export, f, indent=2)
+        with open(export_file, 'wb') as f:
+            f.write(_json_dumps(episodes_to_export, indent=True))
         print(f"Export complete. You can use this file for manual handling of episodes.")
         print("Note: The Podcastindex API does not support direct episode deletion or updates through their public API.")
         print("If you need to remove or update duplicate episodes, please contact Podcastindex support with the specific episode IDs.")
 
 
-def setup_config():
-    """Set up configuration file for API credentials"""
-    config = configparser.ConfigParser()
-    config_file = 'podcastindex_config.ini'
+CONFIG_FILE = 'podcastindex_config.json'
+LEGACY_CONFIG_FILE = 'podcastindex_config.ini'
+
+# Credentials loaded by setup_config, kept for the lifetime of the process
+_CREDS: Optional[Tuple[str, str]] = None
+
+
+def _load_config() -> Optional[Tuple[str, str]]:
+    """Load API credentials from the config file, migrating the old INI file if needed"""
+    if os.path.exists(CONFIG_FILE):
+        try:
+            with open(CONFIG_FILE, 'rb') as f:
+                config = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        if isinstance(config, dict) and config.get('key') and config.get('secret'):
+            return config['key'], config['secret']
+        return None
     
-    # Check if config file exists
-    if os.path.exists(config_file):
-        config.read(config_file)
+    if os.path.exists(LEGACY_CONFIG_FILE):
+        config = configparser.ConfigParser()
+        config.read(LEGACY_CONFIG_FILE)
         
-        # Check if API credentials are in config
         if 'API' in config and 'key' in config['API'] and 'secret' in config['API']:
-            return config['API']['key'], config['API']['secret']
+            creds = config['API']['key'], config['API']['secret']
+            _save_config(*creds)
+            return creds
+    
+    return None
+
+
+def _save_config(api_key: str, api_secret: str) -> None:
+    """Save API credentials to the config file"""
+    with open(CONFIG_FILE, 'wb') as f:
+        f.write(_json_dumps({'key': api_key, 'secret': api_secret}, indent=True))
+
+
+def setup_config():
+    """Set up API credentials from the environment or the config file"""
+    global _CREDS
+    if _CREDS is not None:
+        return _CREDS
+    
+    # Credentials from the environment take precedence and avoid touching the disk
+    api_key = os.environ.get('PODCASTINDEX_API_KEY')
+    api_secret = os.environ.get('PODCASTINDEX_API_SECRET')
+    if api_key and api_secret:
+        _CREDS = api_key, api_secret
+        return _CREDS
+    
+    _CREDS = _load_config()
+    if _CREDS is not None:
+        return _CREDS
     
     # If not, prompt for API credentials
     print("Podcastindex API credentials not found. Please enter them below:")
@@ -271,15 +463,10 @@ def setup_config():
     api_secret = input("API Secret: ")
     
     # Save credentials to config file
-    config['API'] = {
-        'key': api_key,
-        'secret': api_secret
-    }
-    
-    with open(config_file, 'w') as f:
-        config.write(f)
+    _save_config(api_key, api_secret)
     
-    return api_key, api_secret
+    _CREDS = api_key, api_secret
+    return _CREDS
 
 
 def main():
@@ -291,6 +478,8 @@ def main():
     parser.add_argument('--list', action='store_true', help='List all episodes for the podcast')
     parser.add_argument('--find-duplicates', action='store_true', help='Find duplicate episodes')
     parser.add_argument('--export-only', action='store_true', help='Export duplicate episodes to a JSON file')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write cached API responses')
+    parser.add_argument('--cache-ttl', type=int, help='Override how long API responses are cached, in seconds')
     
     args = parser.parse_args()
     
@@ -302,25 +491,29 @@ def main():
     api_key, api_secret = setup_config()
     
     # Create podcast inspector
-    inspector = PodcastInspector(api_key, api_secret)
+    cache = None if args.no_cache else TTLCache()
+    inspector = PodcastInspector(api_key, api_secret, cache, args.cache_ttl)
     
     try:
         # Get podcast information
         if args.feed_url:
             print(f"Getting podcast information for feed URL: {args.feed_url}")
             podcast = inspector.get_podcast_by_feed_url(args.feed_url)
+            episodes = None
         else:
-            print(f"Getting podcast information for feed ID: {args.feed_id}")
-            podcast = inspector.get_podcast_by_feed_id(args.feed_id)
+            # The feed ID is already known, so podcast info and episodes can be fetched together
+            print(f"Getting podcast information and episodes for feed ID: {args.feed_id}")
+            podcast, episodes = inspector.get_podcast_and_episodes_by_feed_id(args.feed_id)
         
         print(f"\nPodcast: {podcast.get('title')}")
         print(f"Feed ID: {podcast.get('id')}")
         print(f"URL: {podcast.get('url')}")
         
         # Get episodes
-        feed_id = podcast.get('id')
-        print(f"\nGetting episodes for feed ID: {feed_id}")
-        episodes = inspector.get_episodes_by_feed_id(feed_id)
+        if episodes is None:
+            feed_id = podcast.get('id')
+            print(f"\nGetting episodes for feed ID: {feed_id}")
+            episodes = inspector.get_episodes_by_feed_id(feed_id)
         
         # List episodes if requested
         if args.list:
@@ -338,6 +531,8 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        inspector.close()
 
 
 if __name__ == "__main__":